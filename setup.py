@@ -1,6 +1,5 @@
 ﻿# Copyright (C)
 
-import os
 from distutils.core import setup
 
 from setuptools import find_packages, setup
@@ -20,19 +19,6 @@ PROJECT_URLS = {
     "Source Code": "https://github.com/johnlem/codpy_alpha",
 }
 
-codpy_path = os.path.dirname(__file__)
-codpy_path = os.path.join(codpy_path, "codpy")
-
-
-def package_files(directory):
-    paths = []
-    for path, directories, filenames in os.walk(directory):
-        for filename in filenames:
-            paths.append(os.path.join("..", path, filename))
-    return paths
-
-
-extra_files = package_files(codpy_path)
 long_description = open("README.md", "r").read()
 
 # print("find_packages():",find_packages(),)
@@ -49,7 +35,6 @@ setup(
     package_dir={"": "src"},
     packages=find_packages(where="src"),
     include_package_data=True,
-    package_data={"": extra_files},
     classifiers=[
         # trove classifiers
         # the full list is here: https://pypi.python.org/pypi?%3aaction=list_classifiers
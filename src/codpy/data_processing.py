@@ -4,7 +4,7 @@ import pandas as pd
 from codpy.core import *
 from codpy.data_conversion import get_data, my_len
 from codpy.metrics import *
-from codpy.selection import column_selector, select_constant_columns
+from codpy.selection import column_selector, get_matching_cols, select_constant_columns
 
 
 def get_bound_box(mat: np.ndarray, coeff=None) -> np.ndarray:
@@ -69,18 +69,6 @@ def bound_box(mat: np.ndarray, bounding_box: np.ndarray) -> np.ndarray:
     return out
 
 
-def get_matching_cols(a, match):
-    if isinstance(match, list):
-        out = []
-
-        def fun(out, m):
-            out += m
-
-        [fun(out, get_matching_cols(a, m)) for m in match]
-        return out
-    return [col for col in a.columns if match in col]
-
-
 def variable_selector(**params) -> dict:
     """
     Implements a greedy algorithm for feature selection in a dataset, aiming to minimize the prediction error.
@@ -1,15 +1,63 @@
+from math import comb
 from typing import Tuple
 
 import numpy as np
 from codpydll import *
 from sklearn import linear_model
-from sklearn.preprocessing import PolynomialFeatures
 
 import codpy.core as core
 from codpy.algs import alg
 from codpy.core import diffops
 from codpy.lalg import lalg as lalg
-from codpy.permutation import lsap
+from codpy.permutation import lsap, sinkhorn
+
+
+def _poly_features(x: np.ndarray, degree: int, out: np.ndarray = None) -> np.ndarray:
+    """
+    Compute the polynomial features of ``x`` up to ``degree``, including the bias column.
+
+    The output matches :class:`sklearn.preprocessing.PolynomialFeatures` with its default settings (same columns, same order).
+    Each block of degree $d$ is obtained by multiplying slices of the degree $d-1$ block by a column of ``x``,
+    so that no intermediate array of size $N \\times N_{poly} \\times D$ is allocated.
+
+    :param x: Input data points :math:`(N, D)`.
+    :type x: :class:`numpy.ndarray`
+    :param degree: The polynomial degree.
+    :type degree: :class:`int`
+    :param out: An optional array of the output size, in which the features are written.
+    :type out: :class:`numpy.ndarray`, optional
+
+    :returns: The polynomial features of size :math:`(N, \\binom{D+degree}{degree})`.
+    :rtype: :class:`numpy.ndarray`
+    """
+    x = np.asarray(x)
+    n_samples, n_features = x.shape
+    if out is None:
+        dtype = np.result_type(x.dtype, np.float32)
+        out = np.empty((n_samples, comb(n_features + degree, degree)), dtype=dtype)
+    out[:, 0] = 1
+    if degree == 0:
+        return out
+    out[:, 1 : n_features + 1] = x
+    # index[i] is the first column of the previous degree block whose terms only involve features >= i
+    index = list(range(1, n_features + 2))
+    current = n_features + 1
+    for _ in range(2, degree + 1):
+        new_index = []
+        end = index[-1]
+        for feature in range(n_features):
+            start = index[feature]
+            new_index.append(current)
+            next_ = current + end - start
+            np.multiply(
+                out[:, start:end],
+                x[:, feature : feature + 1],
+                out=out[:, current:next_],
+            )
+            current = next_
+        new_index.append(current)
+        index = new_index
+    return out
 
 
 class Kernel:
@@ -35,6 +83,15 @@ class Kernel:
             
     """ 
 
+    # floating type of the Codpy interface, which computes in double precision.
+    dtype = np.float64
+    # whether a polynomial order is used, updated with the polynomial regressor, see :func:`_set_polynomial_regressor`.
+    _has_poly = False
+    # whether ``y`` is a view of ``x``, that is if the Gram matrix is the square K(x,x), see :meth:`add`.
+    _y_is_x = True
+    # size in bytes up to which the buffer of polynomial features is kept, see :func:`_get_poly_buffer`.
+    max_poly_buffer_bytes = 2**26
+
     def __init__(
         self,
         x=None,
@@ -70,9 +127,11 @@ class Kernel:
         """
         self.dim = dim
         self.order = order
+        self._has_poly = order is not None
         self.reg = reg
         self.max_pool = int(max_pool)
         self.max_nystrom = int(max_nystrom)
+        self.Delta = None
 
         if set_kernel is not None:
             self.set_kernel = set_kernel
@@ -109,6 +168,9 @@ class Kernel:
         """
         Set a custom kernel using `core.kernel_helper2` with flexible parameters.
 
+        The kernel of the current instance is replaced. If ``x`` is already set, the kernel is rescaled to it
+        and the Gram matrices are recomputed at their next use.
+
         :param kernel_name: Name of the kernel function to use (e.g., ``'gaussian'``).
         :type kernel_name: :class:`str`
         :param map_name: Name of the mapping function (e.g., ``'standardmean'``).
@@ -126,8 +188,16 @@ class Kernel:
         kernel_function = core.kernel_setter(
             kernel_name, map_name, poly_order, reg, bandwidth
         )
-        ## tester!!!!!!!!!!!!!!!!!!!
-        self = Kernel(set_kernel=kernel_function)
+        self.set_kernel = kernel_function
+        # the kernel is retrieved from the new initializer at its next use, see :func:`get_kernel`
+        if hasattr(self, "kernel"):
+            del self.kernel
+        if self.get_x() is not None:
+            # quantities computed with the previous kernel
+            self._set_knm_inv(None)
+            self._set_knm(None)
+            self.Delta = None
+            self.rescale()
 
     def get_order(self, **kwargs) -> int:
         """
@@ -167,7 +237,8 @@ class Kernel:
         Example:
             >>> kernel._set_polynomial_regressor(x_data, fx_data)
         """
-        if x is None or fx is None or self.get_order() is None:
+        self._has_poly = self.get_order() is not None
+        if x is None or fx is None or not self._has_poly:
             self.polyvariables, self.polynomial_kernel, self.polynomial_values = (
                 None,
                 None,
@@ -176,7 +247,7 @@ class Kernel:
             return
         order = self.get_order()
         if order is not None and fx is not None and x is not None:
-            self.polyvariables = PolynomialFeatures(order).fit_transform(x)
+            self.polyvariables = _poly_features(x, order)
             self.polynomial_kernel = linear_model.LinearRegression().fit(
                 self.polyvariables, fx
             )
@@ -269,21 +340,48 @@ class Kernel:
             >>> z_data = np.random.rand(100, 10)
             >>> pred = kernel.get_polynomial_regressor(z_data)
         """
-        if self.get_order() is None:
+        if not self._has_poly:
             return None
-        if x is None:
+        if x is None or x is self.get_x():
+            # reuse the expansion of the training set
             polyvariables = self._get_polyvariables()
         else:
-            polyvariables = PolynomialFeatures(self.order).fit_transform(x)
+            polyvariables = _poly_features(x, self.order)
         if fx is None:
             polynomial_kernel = self._get_polynomial_kernel()
         else:
             polynomial_kernel = linear_model.LinearRegression().fit(polyvariables, fx)
-        z_polyvariables = PolynomialFeatures(self.order).fit_transform(z)
         if polynomial_kernel is not None:
-            return polynomial_kernel.predict(z_polyvariables)
+            z = np.asarray(z)
+            return polynomial_kernel.predict(
+                _poly_features(z, self.order, out=self._get_poly_buffer(z))
+            )
         return None
 
+    def _get_poly_buffer(self, z: np.ndarray) -> np.ndarray:
+        """
+        Return a buffer for the polynomial features of ``z``, reused across calls, e.g. by :meth:`update`.
+
+        The buffer is sized to the largest input seen, and kept for the life of the object as long as it is smaller
+        than ``max_poly_buffer_bytes``: this saves an allocation per call for small batches, at the cost of this
+        memory. Larger inputs get a new array, that is not kept. The features written in it are only valid until
+        the next call.
+        """
+        shape = (z.shape[0], comb(z.shape[1] + self.order, self.order))
+        dtype = np.result_type(z.dtype, np.float32)
+        if shape[0] * shape[1] * dtype.itemsize > self.max_poly_buffer_bytes:
+            return np.empty(shape, dtype=dtype)
+        buffer = getattr(self, "_poly_buf", None)
+        if (
+            buffer is None
+            or buffer.shape[0] < shape[0]
+            or buffer.shape[1] != shape[1]
+            or buffer.dtype != dtype
+        ):
+            buffer = np.empty(shape, dtype=dtype)
+            self._poly_buf = buffer
+        return buffer[: shape[0]]
+
     def Knm(
         self, x: np.ndarray, y: np.ndarray, fy: np.ndarray = [], **kwargs
     ) -> np.ndarray:
@@ -342,23 +440,29 @@ class Kernel:
         if not hasattr(self, "knm_inv"):
             self.knm_inv = None
         if self.knm_inv is None:
-            epsilon = kwargs.get("epsilon", self.reg)
-            epsilon_delta = kwargs.get("epsilon_delta", None)
-            if epsilon_delta is None:
-                epsilon_delta = []
-            else:
-                epsilon_delta = epsilon_delta * self.get_Delta()
-            self._set_knm_inv(
-                core.op.Knm_inv(
-                    x=self.get_x(),
-                    y=self.get_y(),
-                    epsilon=epsilon,
-                    reg_matrix=epsilon_delta,
-                ),
-                **kwargs,
-            )
+            self._set_knm_inv(self._knm_inv(**kwargs), **kwargs)
         return self.knm_inv
 
+    def _knm_inv(self, fx: np.ndarray = [], **kwargs) -> np.ndarray:
+        """
+        Compute the least squares inverse :math:`K^{-1}(x, y)`, or if ``fx`` is provided the product :math:`K^{-1}(x, y) f(x)`
+        without forming the inverse. The result is not stored, see :meth:`get_knm_inv`.
+        """
+        epsilon = kwargs.get("epsilon", self.reg)
+        epsilon_delta = kwargs.get("epsilon_delta", None)
+        if epsilon_delta is None:
+            epsilon_delta = []
+        else:
+            epsilon_delta = epsilon_delta * self.get_Delta()
+        out = core.op.Knm_inv(
+            x=self.get_x(),
+            y=self.get_y(),
+            fx=fx,
+            epsilon=epsilon,
+            reg_matrix=epsilon_delta,
+        )
+        return out
+
     def get_knm(self, **kwargs) -> np.ndarray:
         """
         Retrieve or compute the Gram matrix $K(x, y)$ for the kernel.
@@ -377,6 +481,17 @@ class Kernel:
     def _set_knm(self, k):
         self.knm = k
 
+    def _get_data(self, a: np.ndarray, copy: bool = True) -> np.ndarray:
+        """
+        Convert ``a`` to a C-contiguous array of type :attr:`dtype`, copied if ``copy`` is ``True``.
+
+        Data are stored in the type of the Codpy interface, so that they are converted once when set,
+        rather than at each call to the kernel operators.
+        """
+        if copy:
+            return np.array(a, dtype=self.dtype, order="C")
+        return np.ascontiguousarray(a, dtype=self.dtype)
+
     def get_x(self, **kwargs) -> np.ndarray:
         """
         Retrieve the input data ``x``.
@@ -389,7 +504,12 @@ class Kernel:
         return self.x
 
     def set_x(
-        self, x: np.ndarray, set_polynomial_regressor: bool = True, **kwargs
+        self,
+        x: np.ndarray,
+        set_polynomial_regressor: bool = True,
+        copy: bool = True,
+        preserve_kernels: bool = False,
+        **kwargs,
     ) -> None:
         """
         Set the input data ``x`` for the kernel and update related internal states.
@@ -401,16 +521,30 @@ class Kernel:
         :param set_polynomial_regressor: Whether to recalculate the polynomial regressor after setting the data.
                                         Defaults to ``True``.
         :type set_polynomial_regressor: :class:`bool`, optional
-        """
-        self.x = x.copy()
-        self.set_y()
+        :param copy: Whether to store a copy of ``x``. Set to ``False`` when ``x`` is already owned by the caller,
+                    e.g. a freshly computed array. Defaults to ``True``.
+        :type copy: :class:`bool`, optional
+        :param preserve_kernels: If ``True``, the Gram matrix, its inverse and the kernel scaling are kept, the caller
+                    being responsible to set them consistently with ``x``, see :meth:`add`. ``y`` is set to ``x`` and the
+                    coefficients ``theta`` are reset. Defaults to ``False``.
+        :type preserve_kernels: :class:`bool`, optional
+        """
+        self.x = self._get_data(x, copy=copy)
+        if preserve_kernels:
+            self.y = self._get_x_view()
+            self._y_is_x = True
+            self.Delta = None
+            self.set_theta(None)
+        else:
+            self.set_y()
         if set_polynomial_regressor:
             self._set_polynomial_regressor()
-        self._set_knm_inv(None)
-        self._set_knm(None)
-        self.rescale()
+        if not preserve_kernels:
+            self._set_knm_inv(None)
+            self._set_knm(None)
+            self.rescale()
 
-    def set_y(self, y: np.ndarray = None, **kwargs) -> None:
+    def set_y(self, y: np.ndarray = None, copy: bool = True, **kwargs) -> None:
         """
         Set the target data ``y`` for the kernel. If no target data is provided, ``y`` is set equal to ``x``.
 
@@ -422,13 +556,31 @@ class Kernel:
 
         :param y: Target data points. If None, ``y`` is set equal to ``x``.
         :type y: :class:`numpy.ndarray`, optional
+        :param copy: Whether to store a copy of ``y``. Defaults to ``True``.
+        :type copy: :class:`bool`, optional
+
+        Note:
+            If ``y`` is None, ``y`` is a read-only view of ``x``: it shares its memory, without copy,
+            and ``x`` cannot be modified through ``y``.
         """
         if y is None:
-            self.y = self.get_x()
+            self.y = self._get_x_view()
         else:
-            self.y = y.copy()
+            self.y = self._get_data(y, copy=copy)
+        self._y_is_x = y is None
         self._set_knm_inv(None)
         self._set_knm(None)
+        self.Delta = None
+
+    def _get_x_view(self) -> np.ndarray:
+        """
+        Return a read-only view of ``x``, or ``None`` if ``x`` is not set. See :meth:`set_y`.
+        """
+        view = self.get_x()
+        if view is not None:
+            view = view.view()
+            view.setflags(write=False)
+        return view
 
     def get_y(self, **kwargs) -> np.ndarray:
         """
@@ -453,7 +605,11 @@ class Kernel:
         return self.fx
 
     def set_fx(
-        self, fx: np.ndarray, set_polynomial_regressor: bool = True, **kwargs
+        self,
+        fx: np.ndarray,
+        set_polynomial_regressor: bool = True,
+        copy: bool = True,
+        **kwargs,
     ) -> None:
         """
         Set the function values ``fx`` for the input data.
@@ -463,9 +619,11 @@ class Kernel:
         :param set_polynomial_regressor: Whether to recalculate the polynomial regressor after setting the function values.
                                         Defaults to ``True``.
         :type set_polynomial_regressor: :class:`bool`, optional
+        :param copy: Whether to store a copy of ``fx``. Defaults to ``True``.
+        :type copy: :class:`bool`, optional
         """
         if fx is not None:
-            self.fx = fx.copy()
+            self.fx = self._get_data(fx, copy=copy)
         else:
             self.fx = None
         if set_polynomial_regressor:
@@ -504,7 +662,7 @@ class Kernel:
         if not hasattr(self, "theta") or self.theta is None:
             # If a polynomial order is defined and the function values `fx` are available,
             # compute the residual `fx` by subtracting the polynomial regressor's contribution.
-            if self.get_order() is not None and self.get_fx() is not None:
+            if self._has_poly and self.get_fx() is not None:
                 fx = self.fx - self.get_polynomial_regressor(z=self.get_x())
             else:
                 ##
@@ -514,19 +672,25 @@ class Kernel:
                 self.theta = None
             else:
                 # Compute the regression coefficient `theta` using the kernel matrix inverse and the function values.
-                self.theta = lalg.prod(self.get_knm_inv(), fx)
+                # If the inverse is not already available, solve for `theta` directly instead of forming it.
+                if hasattr(self, "knm_inv") and self.knm_inv is not None:
+                    self.theta = lalg.prod(self.knm_inv, fx)
+                else:
+                    self.theta = self._knm_inv(fx=fx)
         return self.theta
 
     def get_Delta(self) -> np.ndarray:
         """
         Compute and retrieve the discrete Laplace-Beltrami operator ``Delta``.
 
+        The operator is computed once and reused until ``x`` or ``y`` is set again.
+
         :returns: The Laplace-Beltrami operator.
         :rtype: :class:`numpy.ndarray`
         """
 
-        if self.Delta is None:
-            self.Delta = diffops.nablaT_nabla(self.y, self.x)
+        if not hasattr(self, "Delta") or self.Delta is None:
+            self.Delta = diffops.nablaT_nabla(self.get_y(), self.get_x())
         return self.Delta
 
     def select(self, x, N, fx=None, all=False, norm_="frobenius", **kwargs):
@@ -592,17 +756,15 @@ class Kernel:
             if all is True:
                 # if there is a flag all, then
                 # f_\theta(.) = K(.,Y)K(X,Y)^{-1}f(X)
-                self.set(
-                    x=self.x,
-                    y=self.x[indices],
-                    fx=self.fx,
-                    set_polynomial_regressor=False,
-                )
+                # x and fx are already set, fancy indexing returns a new array
+                self.set_y(self.x[indices], copy=False)
             else:
                 # else X = Y is set:
                 #  f_\theta(.) = K(.,Y)K(Y,Y)^{-1}f(Y)
-                self.set_x(self.x[indices], set_polynomial_regressor=False)
-                self.set_fx(self.fx[indices], set_polynomial_regressor=False)
+                self.set_x(self.x[indices], set_polynomial_regressor=False, copy=False)
+                self.set_fx(
+                    self.fx[indices], set_polynomial_regressor=False, copy=False
+                )
                 self.set_theta(theta)
             return indices
 
@@ -614,28 +776,32 @@ class Kernel:
         # if the size of x => N, then it
         # returns the points having the largest distance
         # with respect to maximum mean discrepancy (MMD)
+        x = self.get_x()
         indice = 0
         indices = [0]
-        complement_indices = list(range(1, x.shape[0]))
-        Dnm = None
-        for n in range(N - 1):
-            # Computed MMD distance matrix
-            _Dnm = core.op.Dnm(x[[indice]], x[complement_indices])
-            if Dnm is None:
-                Dnm = _Dnm.copy()
-            else:
-                Dnm = np.concatenate([Dnm, _Dnm], axis=0)
-            new_indice = np.max(Dnm, axis=0)
+        # mask of the points not selected yet
+        complement = np.ones(x.shape[0], dtype=bool)
+        # maximum MMD distance of each point to the selected ones, updated in place with
+        # a single row of the distance matrix per selected point. Selected points are kept
+        # at -inf, so that the argmax runs over the complement without a masked copy.
+        max_distance = np.full(x.shape[0], -np.inf)
+        # at most all the points are selected: past it the argmax would run over -inf only
+        for n in range(min(N, x.shape[0]) - 1):
+            complement[indice] = False
+            max_distance[indice] = -np.inf
+            # Computed MMD distance to the last selected point
+            np.maximum(
+                max_distance,
+                core.op.Dnm(x[indice : indice + 1], x).ravel(),
+                out=max_distance,
+                where=complement,
+            )
             # selects the indices with maximum MMD
-            new_indice = np.argmax(new_indice)
-            Dnm = np.delete(Dnm, new_indice, 1)
-            indice = complement_indices[new_indice]
-            complement_indices.remove(indice)
+            indice = int(np.argmax(max_distance))
             indices.append(indice)
-            pass
 
         # Update the internal state with the selected points
-        self.set_x(self.x[indices])
+        self.set_x(self.x[indices], copy=False)
         return indices
 
     def set(
@@ -654,7 +820,7 @@ class Kernel:
         if x is None and fx is None:
             return
         if x is not None and fx is None:
-            self.set_x(core.get_matrix(x.copy()))
+            self.set_x(core.get_matrix(x))
             self.set_y(y=y)
             self.set_fx(None)
             self.rescale()
@@ -674,11 +840,16 @@ class Kernel:
         if x is not None and fx is not None:
             self.set_x(x), self.set_fx(fx), self.set_y(y=y)
             self.rescale()
-            pass
         return self
 
     def map(
-        self, x: np.ndarray, y: np.ndarray, distance: str = None, sub: bool = False
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        distance: str = None,
+        sub: bool = False,
+        solver: str = "lsap",
+        **kwargs,
     ) -> None:
         r"""
         Maps the input data points ``x`` to the target data points ``y`` using the kernel and optimal transport techniques.
@@ -691,6 +862,12 @@ class Kernel:
         :type distance: :class:`str`, optional
         :param sub: Whether to apply a sub-permutation. Defaults to False.
         :type sub: :class:`bool`, optional
+        :param solver: Assignment solver, ``"lsap"`` for the exact LSAP or ``"sinkhorn"`` for its entropic approximation,
+                    which is not optimal in general. Additional keyword arguments (``eps``, ``n_iter``, ``tol``) are passed to
+                    :func:`codpy.permutation.sinkhorn`, which does not support ``sub``.
+        :type solver: :class:`str`, optional
+
+        :raises ValueError: If ``solver`` is unknown, or given arguments it does not support.
 
         :returns: ``None``
 
@@ -708,6 +885,16 @@ class Kernel:
             - If the dimensionalities differ (:math:`D_{source} \neq D_{target}`), a descent-based method is used to encode the data into a lower-dimensional latent space  before finding the optimal permutation, following principles of discrete optimal transport.
             - This permutation can be used to transform the input data $x$ to approximate the target data $y$.
         """
+        if solver not in ("lsap", "sinkhorn"):
+            raise ValueError(
+                "unknown solver " + str(solver) + ", expected 'lsap' or 'sinkhorn'"
+            )
+        if solver == "lsap" and kwargs:
+            raise ValueError(
+                "unexpected arguments for the lsap solver: " + ", ".join(kwargs)
+            )
+        if solver == "sinkhorn" and sub:
+            raise ValueError("sub is only supported by the lsap solver")
         # Set the internal state with input data points `x` and function values `y`
         self.set_x(x), self.set_fx(y)
         # Rescale the input data `x` using the current kernel configuration
@@ -721,9 +908,12 @@ class Kernel:
         else:
             # If the dimensionalities are the same, use the LSAP algorithm to compute the permutation
             D = core.op.Dnm(x=x, y=y, distance=distance)
-            self.permutation = lsap(D, bool(sub))  # Solve LSAP to find permutation
+            if solver == "sinkhorn":
+                self.permutation = sinkhorn(D, **kwargs)
+            else:
+                self.permutation = lsap(D, bool(sub))  # Solve LSAP to find permutation
         # Update `x` based on the computed permutation
-        self.set_x(self.get_x()[self.permutation])
+        self.set_x(self.get_x()[self.permutation], copy=False)
         return self
 
     def __len__(self) -> int:
@@ -798,7 +988,7 @@ class Kernel:
         Knm = core.op.Knm(x=z, y=self.get_y())
 
         # If a polynomial order is defined, remove the polynomial regression component from `fz`
-        if self.order is not None:
+        if self._has_poly:
             # Compute the residual by subtracting the polynomial regressor's prediction from `fz`
             fzz = fz - self.get_polynomial_regressor(z)
         else:
@@ -823,7 +1013,7 @@ class Kernel:
         # err= (err**2).sum()
 
         # If polynomial regression is involved, update the kernel's internal function approximation
-        if self.order is not None:
+        if self._has_poly:
             # Update `fx` by adding the contribution of the polynomial regressor
             self.fx += self.get_polynomial_regressor(z=self.get_x())
 
@@ -859,7 +1049,8 @@ class Kernel:
 
             Here, $[.]$ denotes standard matrix concatenation, where $f(X)$ and $f(Y)$ are the function values for the original and new data points, respectively.
         """
-        x, fx = core.get_matrix(y.copy()), core.get_matrix(fy.copy())
+        # no copy here: set_x and set_fx copy the inputs they do not own
+        x, fx = core.get_matrix(y), core.get_matrix(fy)
         # if self.x is not None and x is not None: x=np.concatenate([self.x,x.copy()])[-self.max_pool:]
         # if self.fx is not None and fx is not None: fx=np.concatenate([self.fx,fx.copy()])[-self.max_pool:]
         if not hasattr(self, "x") or self.x is None:
@@ -868,12 +1059,17 @@ class Kernel:
 
         # the method add computes an updated Gram matrix using the already
         # pre-computed Gram matrix K(x,x).
-        self.Knm, self.Knm_inv, y = alg.add(
-            self.get_knm(), self.get_knm_inv(), self.get_x(), x
-        )
-        self.set_x(y)
+        # the block-inversion only holds for the square Gram matrix K(x,x), that is if y aliases x
+        knm, knm_inv, y = alg.add(self.get_knm(), self.get_knm_inv(), self.get_x(), x)
+        if self._y_is_x:
+            # keeps the block-inversion results, that are computed with the current kernel scaling
+            self.set_x(y, copy=False, preserve_kernels=True)
+            self._set_knm(knm)
+            self._set_knm_inv(knm_inv)
+        else:
+            self.set_x(y, copy=False)
         if fx is not None and self.get_fx() is not None:
-            self.set_fx(np.concatenate([fx, self.get_fx()], axis=0))
+            self.set_fx(np.concatenate([fx, self.get_fx()], axis=0), copy=False)
         else:
             self.set_fx(fx)
 
@@ -896,7 +1092,9 @@ class Kernel:
         :returns: The computed MMD-based distance matrix.
         :rtype: :class:`numpy.ndarray`
         """
-        return core.op.Dnm(x=z, y=self.x)
+        # the distance is induced by the kernel of this instance, not the last one set to the Codpy interface
+        self.set_kernel_ptr()
+        return core.op.Dnm(x=z, y=self.get_x())
 
     def get_kernel(self) -> callable:
         """
@@ -980,7 +1178,7 @@ class Kernel:
 
         Knm = core.op.Knm(x=z, y=self.get_y(), fy=fy)
 
-        if self.order is not None:
+        if self._has_poly:
             polynomial_regressor = self.get_polynomial_regressor(z)
             Knm += polynomial_regressor
 
@@ -107,6 +107,83 @@ def lsap(C: np.ndarray, sub=False) -> np.ndarray:
     return np.array(cd.alg.LSAP(C, sub))
 
 
+def sinkhorn(
+    C: np.ndarray, eps: float = 3e-4, n_iter: int = 3000, tol: float = 1e-3
+) -> np.ndarray:
+    """
+    Approximate the Linear Sum Assignment Problem (LSAP) with entropic optimal transport.
+
+    The transport plan between uniform weights is computed with Sinkhorn iterations, that are matrix-vector products
+    of cost $O(NM)$. To converge for a small ``eps``, the regularization is decreased from the mean cost down to ``eps``,
+    each stage starting from the dual potentials of the previous one. The plan is then rounded to an assignment,
+    each job taking, by decreasing order of confidence, its most likely worker among the ones left.
+
+    The assignment is not optimal in general. Its cost gets closer to the exact LSAP as ``eps`` decreases, provided that
+    the iterations converge, which needs more iterations for smaller ``eps``: a warning is issued otherwise.
+    For moderate sizes, the exact :func:`lsap` is faster.
+
+    Args:
+        C (:class:`numpy.ndarray`): A 2D array representing the cost matrix, with at least as many workers (rows) as jobs (columns).
+        eps (float): Entropic regularization, relative to the mean cost.
+        n_iter (int): Maximum number of Sinkhorn iterations for each value of the regularization.
+        tol (float): The iterations stop when the relative error on the marginals of the plan is below ``tol``.
+
+    Returns:
+        :class:`numpy.ndarray`: An array representing the assignment. For each job (column in the cost matrix), it gives the index of the worker assigned to that job.
+
+    Example:
+        >>> cost_matrix = np.array([[4, 1, 3], [2, 0, 5], [3, 2, 2]])
+        >>> sinkhorn(cost_matrix)
+        # Output: [1, 0, 2]
+    """
+    C = np.asarray(C, dtype=float)
+    N, M = C.shape
+    if N < M:
+        raise Exception(
+            "sinkhorn needs at least as many rows " + str(N) + " as columns " + str(M)
+        )
+    scale = np.abs(C).mean()
+    C = C / (scale if scale > 0 else 1.0)
+    # marginals: each job is assigned once, the workers share the same weight
+    a, b = np.full(N, M / N), np.ones(M)
+    # dual potentials, the plan being exp((f_i + g_j - C_ij) / e)
+    f, g = np.zeros(N), np.zeros(M)
+    e = 1.0
+    while True:
+        e = max(e, eps)
+        # entries far from the support underflow to zero, which is harmless
+        with np.errstate(under="ignore"):
+            K = np.exp((f[:, None] + g[None, :] - C) / e)
+        u, v = np.ones(N), np.ones(M)
+        converged = False
+        for n in range(n_iter):
+            u = a / (K @ v)
+            v = b / (K.T @ u)
+            if n % 10 == 9 and np.abs(u * (K @ v) - a).max() < tol * a[0]:
+                converged = True
+                break
+        f += e * np.log(u)
+        g += e * np.log(v)
+        if e == eps:
+            break
+        e /= 4.0
+    if not converged:
+        warnings.warn(
+            "sinkhorn did not converge in "
+            + str(n_iter)
+            + " iterations, the assignment may be far from optimal: increase n_iter or eps"
+        )
+    log_plan = (f[:, None] + g[None, :] - C) / eps
+
+    out = np.empty(M, dtype=int)
+    # rows already assigned are kept at -inf
+    free = np.zeros(N)
+    for j in np.argsort(-log_plan.max(axis=0)):
+        out[j] = np.argmax(log_plan[:, j] + free)
+        free[out[j]] = -np.inf
+    return out
+
+
 def grid_projection(**kwargs):
     x = kwargs.get("x", [])
     grid_projection_switchDict = {
@@ -1,5 +1,17 @@
+import re
+import weakref
+from bisect import bisect_right
+from itertools import chain
+
+import numpy as np
 import pandas as pd
 
+# shared default for missing selectors, avoids allocating a new list per call
+_EMPTY = ()
+_BISECT_MIN_PREFIXES = 32
+_string_cols_cache = {}
+_starting_cols_cache = {}
+
 
 def column_selector(data,**kwargs):
     """
@@ -10,33 +22,68 @@ def column_selector(data,**kwargs):
         cols_drop (list, optional): List of columns to drop.
         cols_keep (list, optional): List of columns to keep.
         split (bool, optional): If True, returns both the modified and dropped columns as separate DataFrames.
+        copy (bool, optional): If False, a selection of contiguous columns is returned as a view sharing its data with the input DataFrame. Defaults to True.
+
+    If all the selectors are strings, they are matched as column prefixes, otherwise as exact column names.
 
     Returns:
         pd.DataFrame or (pd.DataFrame, pd.DataFrame): Modified DataFrame or a tuple of modified and dropped DataFrames.
     """
-    if isinstance(data,list):return [column_selector(y,**kwargs) for y in data]
+    cols_drop = kwargs.get('cols_drop',_EMPTY)
+    cols_keep = kwargs.get('cols_keep',_EMPTY)
+    split = kwargs.get("split",False)
+    copy = kwargs.get("copy",True)
+    if isinstance(data,list):
+        out = [None]*len(data)
+        frames = [y for y in data if isinstance(y,pd.DataFrame)]
+        if len(frames) < 2 or len(cols_drop)+len(cols_keep) == 0 or not all(frames[0].columns.equals(y.columns) for y in frames[1:]):
+            for i,y in enumerate(data): out[i] = column_selector(y,**kwargs)
+            return out
+        # shared schema: resolve the selection once for the whole batch
+        mask = _resolve_cols(frames[0].columns,cols_drop,cols_keep)
+        for i,y in enumerate(data):
+            out[i] = _project_cols(y,mask,split,copy) if isinstance(y,pd.DataFrame) else column_selector(y,**kwargs)
+        return out
     if not isinstance(data,pd.DataFrame):return data
-    cols_drop = kwargs.get('cols_drop',[])
-    cols_keep = kwargs.get('cols_keep',[])
     if len(cols_drop)+len(cols_keep) == 0: return data
-    if len(cols_drop):test = cols_drop[0]
-    else:test = cols_keep[0]
-    if not isinstance(test,str) :
-        test = set(data.columns) - set(cols_drop)
-        if len(cols_keep): test = [c for c in test if c in cols_keep]
-        return data[test]
-    cols_drop = get_starting_cols(list(data.columns),cols_drop)
-    x0 = data
-    if len(cols_drop):
-        x0 = x0.drop(cols_drop,axis=1)
-    cols_keep = get_starting_cols(list(x0.columns),cols_keep)
-    if len(cols_keep):
-        x0 = x0[cols_keep]
-    if kwargs.get("split",False):
-        trash_cols = set(data.columns)-set(x0.columns)
-        return x0,data[trash_cols]
+    return _project_cols(data,_resolve_cols(data.columns,cols_drop,cols_keep),split,copy)
+
+def _resolve_cols(columns,cols_drop,cols_keep):
+    """
+    Return a boolean mask over ``columns``, true for the columns retained by :func:`column_selector`.
+
+    If the selectors (``cols_drop``, or ``cols_keep`` when there is nothing to drop) are all strings, they are column prefixes, otherwise column names matched exactly.
+    """
+    selectors = cols_drop if len(cols_drop) else cols_keep
+    if all(isinstance(s,str) for s in selectors): return _resolve_cols_by_prefix(columns,cols_drop,cols_keep)
+    return _resolve_cols_by_name(columns,cols_drop,cols_keep)
+
+def _resolve_cols_by_name(columns,cols_drop,cols_keep):
+    mask = ~columns.isin(cols_drop)
+    if len(cols_keep): mask &= columns.isin(cols_keep)
+    return mask
+
+def _resolve_cols_by_prefix(columns,cols_drop,cols_keep):
+    mask = ~columns.isin(_starting_cols_cached(columns,tuple(cols_drop))) if len(cols_drop) else np.ones(len(columns),dtype=bool)
+    if not len(cols_keep): return mask
+    # keep prefixes are only applied if they match at least one remaining column
+    keep_mask = columns.isin(_starting_cols_cached(columns,tuple(cols_keep)))
+    if (keep_mask & mask).any(): mask &= keep_mask
+    return mask
+
+def _project_cols(data,mask,split=False,copy=True):
+    x0 = data if mask.all() else _take_cols(data,mask,copy)
+    if split:
+        return x0,_take_cols(data,~mask,copy)
     return x0
 
+def _take_cols(data,mask,copy=True):
+    if not copy:
+        # a contiguous run of columns is a slice, which pandas returns as a view on the input blocks
+        kept = np.flatnonzero(mask)
+        if len(kept) and kept[-1]-kept[0]+1 == len(kept): return data.iloc[:,kept[0]:kept[-1]+1]
+    return data.loc[:,mask]
+
 # def column_selector(column_selector_x,**kwargs):
 #     if isinstance(column_selector_x,list):return [column_selector(y,**kwargs) for y in column_selector_x]
 #     if not isinstance(column_selector_x,pd.DataFrame):return column_selector_x
@@ -68,19 +115,65 @@ def column_selector(data,**kwargs):
 #     variables_cols_drop = params.get('variables_cols_drop',[])
 #     return column_selector(xs,cols_drop = variables_cols_drop, cols_keep = variables_cols_keep)
 
-def select_list_of_words(list,list_of_words):
-    return [col for col in list if any(word in col for word in list_of_words) ]
+def select_list_of_words(cols,list_of_words):
+    if not len(list_of_words): return []
+    search = re.compile("|".join(map(re.escape,list_of_words))).search
+    return [col for col in cols if search(col) is not None]
 
 def get_matching_cols(a,match):
     if  isinstance(match,list): 
-        out= []
-        def fun(out,m):out+=m
-        [fun(out,get_matching_cols(a,m)) for m in match]
-        return out
-    return [col for col in a.columns if match in col]
+        return list(chain.from_iterable(get_matching_cols(a,m) for m in match))
+    columns = a.columns
+    if columns.inferred_type != "string": return [col for col in columns if match in col]
+    return columns[columns.str.contains(match,regex=False)].tolist()
 
 def get_starting_cols(a,match): 
-    return [col for col in a if isinstance(col,str) and any(col.startswith(m) for m in match)]
+    prefixes = tuple(m for m in match if isinstance(m,str))
+    if not prefixes: return []
+    if len(prefixes) > _BISECT_MIN_PREFIXES: return _get_starting_cols_sorted(a,prefixes)
+    if isinstance(a,pd.Index) and a.inferred_type == "string": return a[a.str.startswith(prefixes)].tolist()
+    return [col for col in _get_string_cols(a) if col.startswith(prefixes)]
+
+def _get_string_cols(a):
+    """
+    Return the string entries of ``a``. As pandas indexes are immutable, the result is cached per :class:`pd.Index` until the index is garbage collected; other iterables are filtered lazily.
+    """
+    if not isinstance(a,pd.Index): return (col for col in a if isinstance(col,str))
+    key = id(a)
+    out = _string_cols_cache.get(key)
+    if out is None:
+        out = tuple(col for col in a if isinstance(col,str))
+        _string_cols_cache[key] = out
+        weakref.finalize(a,_string_cols_cache.pop,key,None)
+    return out
+
+def _starting_cols_cached(columns,prefixes):
+    """
+    Memoized :func:`get_starting_cols` over a :class:`pd.Index`, for repeated selections over the same schema. As for :func:`_get_string_cols`, the results are cached per index until it is garbage collected. ``prefixes`` is a tuple.
+    """
+    key = id(columns)
+    cache = _starting_cols_cache.get(key)
+    if cache is None:
+        cache = _starting_cols_cache[key] = {}
+        weakref.finalize(columns,_starting_cols_cache.pop,key,None)
+    out = cache.get(prefixes)
+    if out is None:
+        out = cache[prefixes] = get_starting_cols(columns,prefixes)
+    return out
+
+def _get_starting_cols_sorted(a,prefixes):
+    """
+    Same as :func:`get_starting_cols` for a large number of prefixes, testing each column against a single candidate prefix found by binary search.
+    """
+    # keep only the shortest prefixes: no remaining prefix starts with another one,
+    # so the largest prefix lower or equal to a column is the only one it can start with
+    sorted_prefixes = []
+    for p in sorted(set(prefixes)):
+        if not sorted_prefixes or not p.startswith(sorted_prefixes[-1]): sorted_prefixes.append(p)
+    def match(col):
+        i = bisect_right(sorted_prefixes,col)
+        return i > 0 and col.startswith(sorted_prefixes[i-1])
+    return [col for col in _get_string_cols(a) if match(col)]
 
 def select_constant_columns(df):
     out = list()
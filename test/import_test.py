@@ -8,11 +8,13 @@ import pandas as pd
 import scipy.stats as stats
 from include import *
 from sklearn.datasets import fetch_california_housing
+from sklearn.preprocessing import PolynomialFeatures
 
 from codpy import core
 from codpy.core import *
-from codpy.kernel import Kernel
+from codpy.kernel import Kernel, _poly_features
 from codpy.lalg import *
+from codpy.permutation import scipy_lsap, sinkhorn
 
 parent_path = os.path.dirname(__file__)
 parent_path = os.path.dirname(parent_path)
@@ -70,6 +72,81 @@ def test_Knm(decimal=3):
     ).Knm(x, x)
 
 
+def test_poly_features(decimal=12):
+    for dim in range(1, 6):
+        x = np.random.randn(10, dim)
+        for degree in range(0, 5):
+            expected = PolynomialFeatures(degree).fit_transform(x)
+            np.testing.assert_almost_equal(
+                _poly_features(x, degree), expected, decimal=decimal
+            )
+            # written in a view of a larger buffer
+            buffer = np.empty((20, expected.shape[1]))
+            out = _poly_features(x, degree, out=buffer[:10])
+            assert np.shares_memory(out, buffer)
+            np.testing.assert_almost_equal(out, expected, decimal=decimal)
+
+    # the buffer is kept up to max_poly_buffer_bytes only
+    model = Kernel(order=2)
+    model.max_poly_buffer_bytes = 10 * 6 * 8
+    small = model._get_poly_buffer(np.random.randn(10, 2))
+    assert np.shares_memory(small, model._get_poly_buffer(np.random.randn(5, 2)))
+    model._get_poly_buffer(np.random.randn(11, 2))
+    assert model._poly_buf is small
+
+
+def test_add(decimal=3):
+    x, fx = np.random.randn(50, 2), np.random.randn(50, 1)
+    y, fy = np.random.randn(20, 2), np.random.randn(20, 1)
+    z = np.random.randn(30, 2)
+    model = Kernel(
+        set_kernel=core.kernel_setter("maternnorm", "standardmean", 0, 1e-9),
+        x=x,
+        fx=fx,
+    )
+    model.add(y, fy)
+    predictions = model(z)
+
+    # refit on the augmented set with the same kernel, that is not rescaled to it
+    model.set_kernel_ptr()
+    X, fX = model.get_x(), model.get_fx()
+    theta = op.Knm_inv(x=X, y=X, fx=fX, epsilon=model.reg)
+    expected = op.Knm(x=z, y=X, fy=theta)
+    np.testing.assert_almost_equal(predictions, expected, decimal=decimal)
+
+
+def _select_reference(x, N):
+    # the former selection loop, that recomputes the distances to the complement set
+    indice, indices = 0, [0]
+    complement_indices = list(range(1, x.shape[0]))
+    Dnm = None
+    for n in range(N - 1):
+        _Dnm = op.Dnm(x[[indice]], x[complement_indices])
+        Dnm = _Dnm.copy() if Dnm is None else np.concatenate([Dnm, _Dnm], axis=0)
+        new_indice = np.argmax(np.max(Dnm, axis=0))
+        Dnm = np.delete(Dnm, new_indice, 1)
+        indice = complement_indices[new_indice]
+        complement_indices.remove(indice)
+        indices.append(indice)
+    return indices
+
+
+def test_select():
+    x = np.random.randn(30, 2)
+    # duplicated points, hence ties in the distances
+    x_ties = np.concatenate([x[:10], x[:10], x[10:]])
+    for x_ in [x, x_ties]:
+        for N in [1, 5, x_.shape[0] - 2, x_.shape[0] - 1]:
+            model = Kernel(
+                set_kernel=core.kernel_setter("maternnorm", "standardmean", 0, 1e-9)
+            )
+            model.set_x(x_)
+            model.set_kernel_ptr()
+            expected = _select_reference(model.get_x(), N)
+            indices = model.select(x_, N)
+            np.testing.assert_array_equal(indices, expected)
+
+
 def test_Knm_inv(decimal=3):
     x = np.random.randn(10, 2)
     fx = np.random.randn(10, 3)
@@ -120,6 +197,24 @@ def test_lsap(decimal=3):
     np.testing.assert_almost_equal(lsap2, lsap1, decimal=decimal)
 
 
+def test_sinkhorn(decimal=3):
+    cost_matrix = np.array([[4, 1, 3], [2, 0, 5], [3, 2, 2]])
+    sinkhorn1 = sinkhorn(cost_matrix)
+    lsap2 = scipy_lsap(cost_matrix)
+
+    np.testing.assert_almost_equal(lsap2, sinkhorn1, decimal=decimal)
+
+    # on a point cloud, the rounded assignment is a permutation of nearly optimal cost
+    rng = np.random.default_rng(0)
+    x, y = rng.normal(size=(100, 2)), rng.normal(size=(100, 2))
+    cost_matrix = np.sqrt(((x[:, np.newaxis, :] - y[np.newaxis, :, :]) ** 2).sum(axis=2))
+    permutation = sinkhorn(cost_matrix)
+    np.testing.assert_array_equal(np.sort(permutation), np.arange(100))
+    cost = cost_matrix[permutation, np.arange(100)].sum()
+    optimal_cost = cost_matrix[scipy_lsap(cost_matrix), np.arange(100)].sum()
+    assert cost <= 1.05 * optimal_cost, f"sinkhorn cost {cost} vs optimal {optimal_cost}"
+
+
 def test_encoder_decoder(alpha=0.05):
     x = np.random.randn(100, 1)
     z = np.random.rand(100, 1)
@@ -250,6 +345,9 @@ def testkernel():
 if __name__ == "__main__":
     testkernel()
     test_Knm()
+    test_poly_features()
+    test_add()
+    test_select()
     test_Knm_inv()
     test_extrapolation_linear(func=func)
     test_norm(func, decimal=3)
@@ -268,6 +366,7 @@ if __name__ == "__main__":
 
 
 # test_lsap(decimal = 3)
+# test_sinkhorn(decimal = 3)
 # test_encoder_decoder()
 # test_match()
 # test_get_normals(decimal=2)
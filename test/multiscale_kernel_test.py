@@ -12,8 +12,12 @@ class MaximalElement(Kernel):
         self.indices = self.select(x,N,**kwargs,all=True)
         self.cluster_centers_ = self.get_x()[self.indices]
         self.labels_ = self(self.get_x())
-    def __call__(self,z, **kwargs):
-        labels = core.op.Dnm(z, self.cluster_centers_).argmin(axis=1)
+    def __call__(self,z, chunk_size=4096, **kwargs):
+        # argmin computed by chunks of rows of z, to never hold the full distance matrix
+        labels = np.empty(z.shape[0], dtype=np.intp)
+        for start in range(0, z.shape[0], chunk_size):
+            stop = min(start + chunk_size, z.shape[0])
+            labels[start:stop] = core.op.Dnm(z[start:stop], self.cluster_centers_).argmin(axis=1)
         return labels
 
 def get_MNIST_data():
@@ -0,0 +1,129 @@
+import gc
+
+import numpy as np
+import pandas as pd
+
+from codpy import selection
+from codpy.selection import column_selector, get_starting_cols
+
+
+def _starting_cols_reference(a, match):
+    return [col for col in a if isinstance(col, str) and any(col.startswith(m) for m in match)]
+
+
+def _column_selector_reference(data, **kwargs):
+    # the former column_selector, the selected columns being listed in the order of data
+    if isinstance(data, list):
+        return [_column_selector_reference(y, **kwargs) for y in data]
+    if not isinstance(data, pd.DataFrame):
+        return data
+    cols_drop = kwargs.get("cols_drop", [])
+    cols_keep = kwargs.get("cols_keep", [])
+    if len(cols_drop) + len(cols_keep) == 0:
+        return data
+    test = cols_drop[0] if len(cols_drop) else cols_keep[0]
+    if not isinstance(test, str):
+        test = set(data.columns) - set(cols_drop)
+        if len(cols_keep):
+            test = [c for c in test if c in cols_keep]
+        return data[[c for c in data.columns if c in test]]
+    cols_drop = _starting_cols_reference(list(data.columns), cols_drop)
+    x0 = data
+    if len(cols_drop):
+        x0 = x0.drop(cols_drop, axis=1)
+    cols_keep = _starting_cols_reference(list(x0.columns), cols_keep)
+    if len(cols_keep):
+        x0 = x0[cols_keep]
+    if kwargs.get("split", False):
+        return x0, data[[c for c in data.columns if c not in x0.columns]]
+    return x0
+
+
+def _assert_frames_equal(result, expected):
+    if isinstance(expected, (list, tuple)):
+        assert type(result) is type(expected) and len(result) == len(expected)
+        for r, e in zip(result, expected):
+            _assert_frames_equal(r, e)
+    elif isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(result, expected)
+    else:
+        assert result is expected
+
+
+columns = ["a1", "a2", "ab", "b1", "b2", "c", "cx", "d", "e"]
+data = pd.DataFrame(np.arange(2 * len(columns)).reshape(2, -1), columns=columns)
+
+prefix_cases = [
+    dict(cols_drop=["a"]),
+    dict(cols_keep=["b"]),
+    dict(cols_keep=["c", "d"], cols_drop=["cx"]),
+    dict(cols_drop=["a"], cols_keep=["a", "b"]),
+    # the keep prefixes match no remaining column, and are not applied
+    dict(cols_drop=["a"], cols_keep=["a1"]),
+    dict(cols_keep=["zz"]),
+    dict(cols_drop=["zz"]),
+]
+
+
+def test_prefix():
+    for kwargs in prefix_cases:
+        expected = _column_selector_reference(data, **kwargs)
+        _assert_frames_equal(column_selector(data, **kwargs), expected)
+        _assert_frames_equal(column_selector(data, copy=False, **kwargs), expected)
+
+
+def test_split():
+    for kwargs in prefix_cases:
+        expected = _column_selector_reference(data, split=True, **kwargs)
+        _assert_frames_equal(column_selector(data, split=True, **kwargs), expected)
+
+
+def test_name():
+    named = pd.DataFrame(np.arange(8).reshape(2, 4), columns=[0, 1, 2, "e"])
+    for kwargs in [
+        dict(cols_drop=[0, 1]),
+        dict(cols_keep=[0, "e"]),
+        dict(cols_drop=[0], cols_keep=[1, 2, 99]),
+        dict(cols_drop=[99]),
+    ]:
+        expected = _column_selector_reference(named, **kwargs)
+        _assert_frames_equal(column_selector(named, **kwargs), expected)
+
+
+def test_list():
+    # frames sharing a schema, mixed with None and frames of another schema
+    other = data[["a1", "b1", "e"]]
+    for frames in [[data, None, data.copy()], [data, other, None, data]]:
+        for kwargs in prefix_cases:
+            expected = _column_selector_reference(frames, **kwargs)
+            _assert_frames_equal(column_selector(frames, **kwargs), expected)
+
+
+def test_memo_eviction():
+    index = pd.Index(["x%d" % i for i in range(10)] + ["y"])
+    key = id(index)
+    assert selection._starting_cols_cached(index, ("x1",)) == ["x1"]
+    assert key in selection._starting_cols_cache
+    del index
+    gc.collect()
+    assert key not in selection._starting_cols_cache
+
+
+def test_bisect():
+    rng = np.random.default_rng(0)
+    cols = ["".join(rng.choice(list("abc"), size=rng.integers(1, 5))) for i in range(200)]
+    cols += [0, 1.5, None]
+    for n_prefixes in [selection._BISECT_MIN_PREFIXES + 1, 60]:
+        prefixes = ["".join(rng.choice(list("abc"), size=rng.integers(1, 4))) for i in range(n_prefixes)]
+        expected = _starting_cols_reference(cols, prefixes)
+        assert get_starting_cols(cols, prefixes) == expected
+        assert get_starting_cols(pd.Index(cols), prefixes) == expected
+
+
+if __name__ == "__main__":
+    test_prefix()
+    test_split()
+    test_name()
+    test_list()
+    test_memo_eviction()
+    test_bisect()